@@ -1,13 +1,12 @@
 import numpy as np
-import numpy_financial as npf
 from typing import Dict, List, Tuple, Optional, Literal
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from data.vehicles import VehicleModel, BY_ID
 import data.constants as const
 from data.scenarios import EconomicScenario, get_active_scenario
 from .inputs import vehicle_data, VehicleInputs
-from .utils import calculate_present_value, discount_to_present, calculate_annualised_cost, calculate_npv_of_payments, calculate_npv_of_annual_cashflows
+from .utils import calculate_present_value, discount_to_present, calculate_annualised_cost, calculate_npv_of_payments, calculate_npv_of_annual_cashflow_rows
 
 
 @dataclass
@@ -31,12 +30,8 @@ class TCOResult:
     scenario_name: str = "baseline"
 
 
-def calculate_tco_from_inputs(vehicle_inputs: VehicleInputs, overrides: Optional[Dict[str, float]] = None) -> TCOResult:
-    """Calculate total cost of ownership using pre-calculated vehicle inputs and optional overrides."""
-    
-    # Get annual kms with potential override
-    annual_kms = vehicle_inputs.get_annual_kms(overrides)
-    
+def _purchase_payments(vehicle_inputs: VehicleInputs) -> Tuple[float, float, float]:
+    """Return (upfront cost, financing cost, NPV of purchase payments) for the purchase method."""
     # Initial costs depend on purchase method
     if vehicle_inputs.purchase_method == 'outright':
         # Outright purchase: pay full initial cost upfront, no financing
@@ -61,29 +56,87 @@ def calculate_tco_from_inputs(vehicle_inputs: VehicleInputs, overrides: Optional
         
         npv_purchase_payments = npv_down_payment + npv_monthly_payments
     
-    # Calculate residual value at end of vehicle life and discount to present
-    residual_value_future = vehicle_inputs.get_residual_value(const.VEHICLE_LIFE, overrides)
-    residual_value_pv = discount_to_present(residual_value_future, const.VEHICLE_LIFE)
-    
-    # Generate lists of annual costs over vehicle life
-    annual_fuel_costs = [vehicle_inputs.get_fuel_cost_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    annual_battery_costs = [vehicle_inputs.get_battery_replacement_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    annual_carbon_costs = [vehicle_inputs.get_carbon_cost_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    annual_maintenance_costs = [vehicle_inputs.get_maintenance_cost_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    annual_charging_labour_costs = [vehicle_inputs.get_charging_labour_cost_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    annual_payload_penalties = [vehicle_inputs.get_payload_penalty_year(year, overrides) for year in range(1, const.VEHICLE_LIFE + 1)]
-    
-    # Calculate NPV of all operating costs
-    total_fuel_cost = calculate_npv_of_annual_cashflows(annual_fuel_costs)
-    total_battery_cost = calculate_npv_of_annual_cashflows(annual_battery_costs)
-    total_carbon_cost = calculate_npv_of_annual_cashflows(annual_carbon_costs)
-    total_maintenance_cost = calculate_npv_of_annual_cashflows(annual_maintenance_costs)
-    total_charging_labour_cost = calculate_npv_of_annual_cashflows(annual_charging_labour_costs)
-    total_payload_penalty = calculate_npv_of_annual_cashflows(annual_payload_penalties)
+    return upfront_cost, financing_cost, npv_purchase_payments
+
+
+def _annual_cost_streams(vehicle_inputs: VehicleInputs, overrides: Optional[Dict[str, float]] = None) -> List[List[float]]:
+    """
+    Generate yearly operating costs over vehicle life.
+    
+    Returns:
+        Six lists of VEHICLE_LIFE yearly costs: fuel, maintenance, battery
+        replacement, carbon, charging labour and payload penalty
+    """
+    years = range(1, const.VEHICLE_LIFE + 1)
+    year_array = np.arange(1, const.VEHICLE_LIFE + 1)
+    return [
+        vehicle_inputs.get_fuel_costs_years(year_array, overrides).tolist(),
+        [vehicle_inputs.get_maintenance_cost_year(year, overrides) for year in years],
+        vehicle_inputs.get_battery_replacement_years(year_array, overrides).tolist(),
+        [vehicle_inputs.get_carbon_cost_year(year, overrides) for year in years],
+        [vehicle_inputs.get_charging_labour_cost_year(year, overrides) for year in years],
+        [vehicle_inputs.get_payload_penalty_year(year, overrides) for year in years],
+    ]
+
+
+def calculate_tco_from_inputs(vehicle_inputs: VehicleInputs, overrides: Optional[Dict[str, float]] = None) -> TCOResult:
+    """Calculate total cost of ownership using pre-calculated vehicle inputs and optional overrides."""
+    return _bulk_tco([vehicle_inputs], overrides)[0]
+
+
+def _bulk_tco(rows: List[VehicleInputs], overrides: Optional[Dict[str, float]] = None) -> List[TCOResult]:
+    """
+    Calculate TCO for many vehicle inputs at once.
+    
+    Each row may carry its own vehicle, scenario and purchase method; overrides
+    apply to every row. Yearly costs for all rows are discounted together as one
+    (n_rows, streams, VEHICLE_LIFE) array.
+    """
+    if not rows:
+        return []
+    
+    years = const.VEHICLE_LIFE
+    
+    # Per-row amounts: annual kms and residual value with potential overrides,
+    # purchase payments for the purchase method, and fixed annual costs
+    (
+        annual_kms,
+        upfront_cost,
+        financing_cost,
+        npv_purchase_payments,
+        annual_insurance,
+        annual_registration,
+        residual_value_future
+    ) = np.array([
+        (
+            row.get_annual_kms(overrides),
+            *_purchase_payments(row),
+            row.annual_insurance_cost,
+            row.vehicle.annual_registration,
+            row.get_residual_value(years, overrides)
+        )
+        for row in rows
+    ], dtype=np.float64).T
+    
+    # NPV of every operating cost stream, shape (n_rows, streams)
+    stream_npvs = calculate_npv_of_annual_cashflow_rows(
+        np.array([_annual_cost_streams(row, overrides) for row in rows], dtype=np.float64)
+    )
+    (
+        total_fuel_cost,
+        total_maintenance_cost,
+        total_battery_cost,
+        total_carbon_cost,
+        total_charging_labour_cost,
+        total_payload_penalty
+    ) = stream_npvs.T
     
     # Fixed annual costs (present value)
-    total_insurance_pv = calculate_present_value(vehicle_inputs.annual_insurance_cost, const.VEHICLE_LIFE)
-    total_registration_pv = calculate_present_value(vehicle_inputs.vehicle.annual_registration, const.VEHICLE_LIFE)
+    total_insurance_pv = calculate_present_value(annual_insurance, years)
+    total_registration_pv = calculate_present_value(annual_registration, years)
+    
+    # Discount residual value at end of vehicle life to present
+    residual_value_pv = discount_to_present(residual_value_future, years)
     
     # Total TCO using NPV of purchase payments
     total_cost = (
@@ -100,27 +153,38 @@ def calculate_tco_from_inputs(vehicle_inputs: VehicleInputs, overrides: Optional
     )
     
     # Calculate annual equivalent and cost per km using potentially overridden annual_kms
-    annual_cost = calculate_annualised_cost(total_cost, const.VEHICLE_LIFE, const.DISCOUNT_RATE)
+    annual_cost = calculate_annualised_cost(total_cost, years, const.DISCOUNT_RATE)
     cost_per_km = annual_cost / annual_kms
     
-    return TCOResult(
-        vehicle_id=vehicle_inputs.vehicle.vehicle_id,
-        total_cost=total_cost,
-        annual_cost=annual_cost,
-        cost_per_km=cost_per_km,
-        purchase_cost=upfront_cost,  # Actual upfront payment
-        fuel_cost=total_fuel_cost,
-        maintenance_cost=total_maintenance_cost,
-        insurance_cost=vehicle_inputs.annual_insurance_cost * const.VEHICLE_LIFE,      # Undiscounted for reporting
-        registration_cost=vehicle_inputs.vehicle.annual_registration * const.VEHICLE_LIFE,  # Undiscounted for reporting
-        battery_replacement_cost=total_battery_cost,
-        financing_cost=financing_cost,
-        residual_value=residual_value_pv,  # Present value of residual value
-        carbon_cost=total_carbon_cost,
-        charging_labour_cost=total_charging_labour_cost,
-        payload_penalty_cost=total_payload_penalty,
-        scenario_name=vehicle_inputs.scenario.name
+    columns = zip(
+        total_cost.tolist(), annual_cost.tolist(), cost_per_km.tolist(),
+        upfront_cost.tolist(), financing_cost.tolist(), residual_value_pv.tolist(),
+        stream_npvs.tolist()
     )
+    return [
+        TCOResult(
+            vehicle_id=row.vehicle.vehicle_id,
+            total_cost=row_total,
+            annual_cost=row_annual,
+            cost_per_km=row_per_km,
+            purchase_cost=row_upfront,  # Actual upfront payment
+            fuel_cost=fuel,
+            maintenance_cost=maintenance,
+            insurance_cost=row.annual_insurance_cost * years,      # Undiscounted for reporting
+            registration_cost=row.vehicle.annual_registration * years,  # Undiscounted for reporting
+            battery_replacement_cost=battery,
+            financing_cost=row_financing,
+            residual_value=row_residual,  # Present value of residual value
+            carbon_cost=carbon,
+            charging_labour_cost=charging_labour,
+            payload_penalty_cost=payload_penalty,
+            scenario_name=row.scenario.name
+        )
+        for row, (
+            row_total, row_annual, row_per_km, row_upfront, row_financing, row_residual,
+            (fuel, maintenance, battery, carbon, charging_labour, payload_penalty)
+        ) in zip(rows, columns)
+    ]
 
 
 def calculate_tco(vehicle: VehicleModel, scenario: Optional[EconomicScenario] = None, purchase_method: Literal['outright', 'financed'] = 'financed') -> TCOResult:
@@ -129,34 +193,58 @@ def calculate_tco(vehicle: VehicleModel, scenario: Optional[EconomicScenario] =
     return calculate_tco_from_inputs(vehicle_inputs)
 
 
+def calculate_tco_both(vehicle: VehicleModel, scenario: Optional[EconomicScenario] = None) -> Tuple[TCOResult, TCOResult]:
+    """
+    Calculate financed and outright TCO for a vehicle in one pass.
+    
+    Operating costs and residual value do not depend on the purchase method, so
+    they are computed once and only the purchase payment lines differ.
+    
+    Returns:
+        Tuple of (financed, outright) TCO results
+    """
+    vehicle_inputs = vehicle_data.get_vehicle(vehicle.vehicle_id, scenario, 'financed')
+    financed = calculate_tco_from_inputs(vehicle_inputs)
+    _, _, npv_financed_payments = _purchase_payments(vehicle_inputs)
+    
+    # Outright purchase pays the full initial cost in year 0 instead
+    total_cost = financed.total_cost - npv_financed_payments + vehicle_inputs.initial_cost
+    annual_cost = calculate_annualised_cost(total_cost, const.VEHICLE_LIFE, const.DISCOUNT_RATE)
+    outright = replace(
+        financed,
+        total_cost=total_cost,
+        annual_cost=annual_cost,
+        cost_per_km=annual_cost / vehicle_inputs.get_annual_kms(),
+        purchase_cost=vehicle_inputs.initial_cost,
+        financing_cost=0.0
+    )
+    return financed, outright
+
+
 def calculate_all_tcos(scenario: Optional[EconomicScenario] = None, purchase_method: Literal['outright', 'financed'] = 'financed') -> Dict[str, TCOResult]:
-    """Calculate TCO for all vehicles in the database."""
-    results = {}
-    for vehicle_id, vehicle_inputs in vehicle_data.get_all_vehicles(scenario, purchase_method).items():
-        results[vehicle_id] = calculate_tco_from_inputs(vehicle_inputs)
-    return results
+    """Calculate TCO for all vehicles in the database as one batch."""
+    all_inputs = vehicle_data.get_all_vehicles(scenario, purchase_method)
+    return dict(zip(all_inputs, _bulk_tco(list(all_inputs.values()))))
 
 
 def compare_vehicle_pairs(scenario: Optional[EconomicScenario] = None, purchase_method: Literal['outright', 'financed'] = 'financed') -> List[Tuple[TCOResult, TCOResult, float]]:
     """Compare TCO between BEV and diesel pairs, returning cost difference."""
-    comparisons = []
+    pairs = vehicle_data.get_vehicle_pairs(scenario, purchase_method)
     
-    for bev_inputs, diesel_inputs in vehicle_data.get_vehicle_pairs(scenario, purchase_method):
-        bev_tco = calculate_tco_from_inputs(bev_inputs)
-        diesel_tco = calculate_tco_from_inputs(diesel_inputs)
-        cost_difference = bev_tco.total_cost - diesel_tco.total_cost
-        comparisons.append((bev_tco, diesel_tco, cost_difference))
+    # Evaluate every BEV and diesel in one batch, then split back into pairs
+    results = _bulk_tco([bev for bev, _ in pairs] + [diesel for _, diesel in pairs])
+    bev_tcos, diesel_tcos = results[:len(pairs)], results[len(pairs):]
     
-    return comparisons
+    return [
+        (bev_tco, diesel_tco, bev_tco.total_cost - diesel_tco.total_cost)
+        for bev_tco, diesel_tco in zip(bev_tcos, diesel_tcos)
+    ]
 
 
 def calculate_scenario_comparison(vehicle_id: str, scenarios: List[EconomicScenario], purchase_method: Literal['outright', 'financed'] = 'financed') -> Dict[str, TCOResult]:
     """Calculate TCO for a single vehicle across multiple scenarios."""
-    results = {}
-    for scenario in scenarios:
-        vehicle_inputs = vehicle_data.get_vehicle(vehicle_id, scenario, purchase_method)
-        results[scenario.name] = calculate_tco_from_inputs(vehicle_inputs)
-    return results
+    rows = [vehicle_data.get_vehicle(vehicle_id, scenario, purchase_method) for scenario in scenarios]
+    return {tco.scenario_name: tco for tco in _bulk_tco(rows)}
 
 
 def calculate_breakeven_analysis(bev_id: str, diesel_id: str, scenarios: List[EconomicScenario], purchase_method: Literal['outright', 'financed'] = 'financed') -> Dict[str, float]:
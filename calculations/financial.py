@@ -3,7 +3,6 @@ Financial calculations for vehicle TCO analysis.
 Handles purchase costs, financing, and depreciation.
 """
 
-import numpy_financial as npf
 from typing import Optional
 
 import data.constants as const
@@ -59,10 +58,19 @@ class FinancingCalculator:
     
     @staticmethod
     def calculate_monthly_payment(loan_amount: float, interest_rate: float) -> float:
-        """Calculate monthly loan payment."""
+        """
+        Calculate monthly loan payment.
+        
+        Formula: PMT = L × r(1 + r)^n / ((1 + r)^n - 1)
+        where L = loan amount, r = monthly rate, n = number of payments
+        """
         monthly_rate = interest_rate / 12
         num_payments = const.FINANCING_TERM * 12
-        return float(npf.pmt(monthly_rate, num_payments, -loan_amount))
+        if monthly_rate == 0:
+            return loan_amount / num_payments
+        
+        growth = (1 + monthly_rate) ** num_payments
+        return loan_amount * monthly_rate * growth / (growth - 1)
     
     @staticmethod
     def calculate_total_financing_cost(monthly_payment: float, loan_amount: float) -> float:
@@ -94,7 +102,6 @@ class DepreciationCalculator:
         # Apply BEV residual value multiplier from scenario if applicable
         if (drivetrain_type == 'BEV' and 
             self.scenario and 
-            self.scenario.bev_residual_value_multiplier and
             year <= len(self.scenario.bev_residual_value_multiplier)):
             remaining_value *= self.scenario.bev_residual_value_multiplier[year - 1]
         
@@ -126,7 +133,6 @@ class DepreciationCalculator:
         # Apply BEV residual value multiplier from scenario if applicable
         if (drivetrain_type == 'BEV' and 
             self.scenario and 
-            self.scenario.bev_residual_value_multiplier and
             year <= len(self.scenario.bev_residual_value_multiplier)):
             residual_value *= self.scenario.bev_residual_value_multiplier[year - 1]
         
@@ -7,6 +7,8 @@ Input calculations and vehicle data management for TCO analysis.
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Literal
 
+import numpy as np
+
 from data.vehicles import VehicleModel, BY_ID, ALL_MODELS
 from data.scenarios import EconomicScenario, get_active_scenario
 
@@ -143,6 +145,14 @@ class VehicleInputs:
         """Get battery replacement cost for a specific year (only year 8 for BEVs)."""
         return self._battery_calculator.get_battery_replacement_year(year, overrides)
     
+    def get_fuel_costs_years(self, years: np.ndarray, overrides: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Get fuel costs for an array of years in one vectorised call."""
+        return self._fuel_calculator.get_fuel_costs_years(years, overrides)
+    
+    def get_battery_replacement_years(self, years: np.ndarray, overrides: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Get battery replacement costs for an array of years in one vectorised call."""
+        return self._battery_calculator.get_battery_replacement_years(years, overrides)
+    
     def get_depreciation_year(self, year: int) -> float:
         """Get depreciation for a specific year."""
         return self._depreciation_calculator.get_depreciation_year(year, self.vehicle.drivetrain_type)
@@ -151,7 +161,7 @@ class VehicleInputs:
         """Get residual value at the end of a specific year."""
         residual_value = self._depreciation_calculator.get_residual_value(year, self.vehicle.drivetrain_type)
         
-        # Apply residual value variation if present
+        # Apply residual value variation if present (mirrored in simulation._total_cost_kernel)
         if overrides and 'residual_value_variation' in overrides:
             residual_value *= overrides['residual_value_variation']
             
@@ -3,7 +3,9 @@ Operating cost calculations for vehicle TCO analysis.
 Handles fuel, maintenance, insurance, and battery replacement costs.
 """
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence
+
+import numpy as np
 
 import data.constants as const
 from data.scenarios import EconomicScenario
@@ -18,9 +20,32 @@ __all__ = [
     'BatteryReplacementCalculator',
     'PayloadPenaltyCalculator',
     'calculate_carbon_cost_year',
+    'battery_life_cost_multiplier',
 ]
 
 
+def _trajectory_values(trajectory: Sequence[float], years: np.ndarray, default: float) -> np.ndarray:
+    """Look up a scenario trajectory for each year (1-based), using default outside its range."""
+    if not len(trajectory):
+        return np.full(years.shape, default, dtype=np.float64)
+    values = np.asarray(trajectory, dtype=np.float64)
+    in_range = (years > 0) & (years <= len(values))
+    if in_range.all():
+        return values[years - 1]
+    return np.where(in_range, values[np.where(in_range, years - 1, 0)], default)
+
+
+def _charging_price(weight_class: str) -> float:
+    """Blended electricity price per kWh for the BEV charging mix of a weight class."""
+    proportions = const.CHARGING_MIX_PROPORTIONS['BEV'][weight_class]
+    return (
+        proportions['retail'] * const.RETAIL_CHARGING_PRICE +
+        proportions['offpeak'] * const.OFFPEAK_CHARGING_PRICE +
+        proportions['solar'] * const.SOLAR_CHARGING_PRICE +
+        proportions['public'] * const.PUBLIC_CHARGING_PRICE
+    )
+
+
 class FuelCostCalculator:
     """Handles fuel cost calculations for both BEV and diesel vehicles."""
     
@@ -32,26 +57,18 @@ class FuelCostCalculator:
         """Calculate base annual electricity cost for BEV."""
         # Account for efficiency improvements from scenario (year 1)
         efficiency_multiplier = 1.0
-        if self.scenario and self.scenario.bev_efficiency_improvement:
+        if self.scenario and len(self.scenario.bev_efficiency_improvement):
             efficiency_multiplier = self.scenario.bev_efficiency_improvement[0]
         
         adjusted_kwh_per_km = self.vehicle.kwh_per_km * efficiency_multiplier
         
-        # Get charging proportions from the new dictionary structure
-        proportions = const.CHARGING_MIX_PROPORTIONS['BEV'][self.vehicle.weight_class]
-        
-        return adjusted_kwh_per_km * self.vehicle.annual_kms * (
-            proportions['retail'] * const.RETAIL_CHARGING_PRICE +
-            proportions['offpeak'] * const.OFFPEAK_CHARGING_PRICE +
-            proportions['solar'] * const.SOLAR_CHARGING_PRICE +
-            proportions['public'] * const.PUBLIC_CHARGING_PRICE
-        )
+        return adjusted_kwh_per_km * self.vehicle.annual_kms * _charging_price(self.vehicle.weight_class)
     
     def calculate_diesel_base_cost(self) -> float:
         """Calculate base annual diesel cost."""
         # Account for efficiency improvements from scenario (year 1)
         efficiency_multiplier = 1.0
-        if self.scenario and self.scenario.diesel_efficiency_improvement:
+        if self.scenario and len(self.scenario.diesel_efficiency_improvement):
             efficiency_multiplier = self.scenario.diesel_efficiency_improvement[0]
         
         adjusted_litres_per_km = self.vehicle.litres_per_km * efficiency_multiplier
@@ -66,52 +83,51 @@ class FuelCostCalculator:
     
     def get_fuel_cost_year(self, year: int, overrides: Optional[Dict[str, float]] = None) -> float:
         """Get fuel cost for a specific year with price escalation and efficiency improvements."""
+        return float(self.get_fuel_costs_years(np.array([year]), overrides)[0])
+    
+    def get_fuel_costs_years(self, years: np.ndarray, overrides: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Get fuel costs for an array of years with price escalation and efficiency improvements."""
+        years = np.asarray(years)
         if self.vehicle.drivetrain_type == 'BEV':
-            # Get price and efficiency multipliers from scenario
-            price_multiplier = self.scenario.get_electricity_price_multiplier(year) if self.scenario else 1.0
+            price_multiplier = (
+                _trajectory_values(self.scenario.electricity_price_trajectory, years, 1.0)
+                if self.scenario else np.ones(years.shape)
+            )
             
             # Apply electricity price variation from overrides
+            # (simulation._total_cost_kernel scales fuel NPV the same way)
             if overrides and 'electricity_price_variation' in overrides:
-                price_multiplier *= overrides['electricity_price_variation']
-                
-            efficiency_multiplier = 1.0
-            if (self.scenario and 
-                self.scenario.bev_efficiency_improvement and 
-                year <= len(self.scenario.bev_efficiency_improvement)):
-                efficiency_multiplier = self.scenario.bev_efficiency_improvement[year - 1]
+                price_multiplier = price_multiplier * overrides['electricity_price_variation']
+            
+            efficiency_multiplier = (
+                _trajectory_values(self.scenario.bev_efficiency_improvement, years, 1.0)
+                if self.scenario else np.ones(years.shape)
+            )
             
             # Apply charging efficiency variation from overrides
             if overrides and 'charging_efficiency_variation' in overrides:
-                efficiency_multiplier *= overrides['charging_efficiency_variation']
+                efficiency_multiplier = efficiency_multiplier * overrides['charging_efficiency_variation']
             
-            # Get charging proportions from the new dictionary structure
-            proportions = const.CHARGING_MIX_PROPORTIONS['BEV'][self.vehicle.weight_class]
-            
-            # Recalculate base cost with year-specific efficiency
-            adjusted_kwh_per_km = self.vehicle.kwh_per_km * efficiency_multiplier
-            base_cost = adjusted_kwh_per_km * self.vehicle.annual_kms * (
-                proportions['retail'] * const.RETAIL_CHARGING_PRICE +
-                proportions['offpeak'] * const.OFFPEAK_CHARGING_PRICE +
-                proportions['solar'] * const.SOLAR_CHARGING_PRICE +
-                proportions['public'] * const.PUBLIC_CHARGING_PRICE
-            )
+            # Base cost with year-specific efficiency
+            base_cost = self.vehicle.kwh_per_km * efficiency_multiplier * self.vehicle.annual_kms * _charging_price(self.vehicle.weight_class)
         else:
-            # Diesel vehicle
-            price_multiplier = self.scenario.get_diesel_price_multiplier(year) if self.scenario else 1.0
+            price_multiplier = (
+                _trajectory_values(self.scenario.diesel_price_trajectory, years, 1.0)
+                if self.scenario else np.ones(years.shape)
+            )
             
             # Apply fuel price variation from overrides
+            # (simulation._total_cost_kernel scales fuel NPV the same way)
             if overrides and 'fuel_price_variation' in overrides:
-                price_multiplier *= overrides['fuel_price_variation']
-                
-            efficiency_multiplier = 1.0
-            if (self.scenario and 
-                self.scenario.diesel_efficiency_improvement and 
-                year <= len(self.scenario.diesel_efficiency_improvement)):
-                efficiency_multiplier = self.scenario.diesel_efficiency_improvement[year - 1]
+                price_multiplier = price_multiplier * overrides['fuel_price_variation']
+            
+            efficiency_multiplier = (
+                _trajectory_values(self.scenario.diesel_efficiency_improvement, years, 1.0)
+                if self.scenario else np.ones(years.shape)
+            )
             
-            # Recalculate base cost with year-specific efficiency
-            adjusted_litres_per_km = self.vehicle.litres_per_km * efficiency_multiplier
-            base_cost = adjusted_litres_per_km * self.vehicle.annual_kms * const.DIESEL_PRICE
+            # Base cost with year-specific efficiency
+            base_cost = self.vehicle.litres_per_km * efficiency_multiplier * self.vehicle.annual_kms * const.DIESEL_PRICE
         
         return base_cost * price_multiplier
 
@@ -170,7 +186,7 @@ class MaintenanceCostCalculator:
         # Get the standard multiplier from the scenario
         multiplier = self.scenario.get_maintenance_cost_multiplier(year) if self.scenario else 1.0
         
-        # Apply the override if it exists
+        # Apply the override if it exists (mirrored in simulation._total_cost_kernel)
         if overrides and 'maintenance_cost_variation' in overrides:
             multiplier *= overrides['maintenance_cost_variation']
             
@@ -202,32 +218,47 @@ class BatteryReplacementCalculator:
         self.scenario = scenario
     
     def get_replacement_cost_year8(self) -> float:
-        """Calculate battery replacement cost for year 8."""
+        """Calculate battery replacement cost in the replacement year (year 8)."""
         if self.vehicle.drivetrain_type != 'BEV' or self.vehicle.battery_capacity_kwh == 0:
             return 0.0
         
         # Use scenario battery price trajectory
         battery_price_year8 = const.BATTERY_REPLACEMENT_COST
         if self.scenario:
-            battery_price_year8 *= self.scenario.get_battery_price_multiplier(8)
+            battery_price_year8 *= self.scenario.get_battery_price_multiplier(const.BATTERY_REPLACEMENT_YEAR)
         
         net_cost_per_kwh = battery_price_year8 - const.BATTERY_RECYCLE_VALUE
         
         return self.vehicle.battery_capacity_kwh * net_cost_per_kwh
     
     def get_battery_replacement_year(self, year: int, overrides: Optional[Dict[str, float]] = None) -> float:
-        """Get battery replacement cost for a specific year (only year 8 for BEVs)."""
-        if year == 8 and self.vehicle.drivetrain_type == 'BEV':
+        """Get battery replacement cost for a specific year (only the replacement year for BEVs)."""
+        if year == const.BATTERY_REPLACEMENT_YEAR and self.vehicle.drivetrain_type == 'BEV':
             base_cost = self.get_replacement_cost_year8()
             
             # Apply battery life variation if present
             if overrides and 'battery_life_variation' in overrides:
-                # Shorter battery life increases replacement cost, longer life reduces it
-                multiplier = 2.0 - overrides['battery_life_variation']  # If life is 0.7x, cost is 1.3x
-                base_cost *= multiplier
+                base_cost *= battery_life_cost_multiplier(overrides['battery_life_variation'])
                 
             return base_cost
         return 0.0
+    
+    def get_battery_replacement_years(self, years: np.ndarray, overrides: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Vectorised get_battery_replacement_year over an array of years."""
+        years = np.asarray(years)
+        replacement_year = const.BATTERY_REPLACEMENT_YEAR
+        return np.where(years == replacement_year, self.get_battery_replacement_year(replacement_year, overrides), 0.0)
+
+
+def battery_life_cost_multiplier(battery_life_variation):
+    """
+    Convert a battery life variation into a replacement cost multiplier.
+    
+    Shorter battery life increases replacement cost and longer life reduces it
+    (life 0.7x -> cost 1.3x). Works on floats and NumPy arrays alike, so the
+    Monte Carlo kernel shares this definition with the scalar path.
+    """
+    return 2.0 - battery_life_variation
 
 
 def calculate_carbon_cost_year(vehicle: VehicleModel, year: int, scenario: Optional[EconomicScenario] = None, overrides: Optional[Dict[str, float]] = None) -> float:
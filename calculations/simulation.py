@@ -7,6 +7,7 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
 from .inputs import VehicleInputs
+from .operating import battery_life_cost_multiplier
 from data import constants as const
 from data.scenarios import EconomicScenario
 
@@ -41,6 +42,58 @@ class UncertaintyParameter:
             return np.random.triangular(self.min_value, self.mode_value, self.max_value)
         else:
             return self.base_value
+    
+    def sample_many(self, n: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Sample n values from the distribution in a single vectorised draw.
+        
+        Uses the global NumPy random state (as sample() does) unless a
+        Generator is supplied.
+        """
+        rng = np.random if rng is None else rng
+        if self.distribution == 'normal':
+            return np.maximum(0, rng.normal(self.base_value, self.std_dev, n))
+        elif self.distribution == 'uniform':
+            return rng.uniform(self.min_value, self.max_value, n)
+        elif self.distribution == 'triangular':
+            return rng.triangular(self.min_value, self.mode_value, self.max_value, n)
+        else:
+            return np.full(n, self.base_value, dtype=np.float64)
+
+
+def _total_cost_kernel(base_tco: 'TCOResult', drivetrain_type: str, overrides: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Evaluate total cost for a batch of override values in one vectorised pass.
+    
+    Each override that changes total cost scales exactly one NPV component of the
+    un-overridden TCO (fuel, maintenance, battery replacement or residual value),
+    so the batch is a linear combination of those components rather than a full
+    recalculation per sample. As in calculate_tco_from_inputs, unknown keys are
+    ignored and annual_kms_variation only affects cost per km.
+    
+    The override semantics mirror the scalar path: fuel in
+    FuelCostCalculator.get_fuel_costs_years, maintenance in
+    MaintenanceCostCalculator.get_maintenance_cost_year, battery life in
+    battery_life_cost_multiplier and residual value in
+    VehicleInputs.get_residual_value. Keep them in step when either changes.
+    """
+    def multiplier(key: str) -> np.ndarray:
+        return np.asarray(overrides.get(key, 1.0), dtype=np.float64)
+    
+    if drivetrain_type == 'BEV':
+        fuel_multiplier = multiplier('electricity_price_variation') * multiplier('charging_efficiency_variation')
+    else:
+        fuel_multiplier = multiplier('fuel_price_variation')
+    
+    battery_multiplier = battery_life_cost_multiplier(multiplier('battery_life_variation'))
+    
+    return (
+        base_tco.total_cost +
+        base_tco.fuel_cost * (fuel_multiplier - 1) +
+        base_tco.maintenance_cost * (multiplier('maintenance_cost_variation') - 1) +
+        base_tco.battery_replacement_cost * (battery_multiplier - 1) -
+        base_tco.residual_value * (multiplier('residual_value_variation') - 1)
+    )
 
 
 @dataclass
@@ -62,9 +115,9 @@ class SimulationResults:
         self.min_value = np.min(self.tco_values)
         self.max_value = np.max(self.tco_values)
         
-        # Calculate percentiles
-        for p in [5, 10, 25, 50, 75, 90, 95]:
-            self.percentiles[p] = np.percentile(self.tco_values, p)
+        # Calculate all percentiles in a single pass
+        levels = [5, 10, 25, 50, 75, 90, 95]
+        self.percentiles.update(zip(levels, np.percentile(self.tco_values, levels)))
             
         self.confidence_interval_95 = (self.percentiles[5], self.percentiles[95])
 
@@ -146,38 +199,50 @@ class MonteCarloSimulation:
         """Add or override an uncertainty parameter."""
         self.parameters[param.name] = param
     
-    def run(self, iterations: int = 10000, seed: Optional[int] = None) -> SimulationResults:
-        """Run Monte Carlo simulation."""
+    def run(self, iterations: int = 10000, seed: Optional[int] = None, rng: Optional[np.random.Generator] = None) -> SimulationResults:
+        """Run Monte Carlo simulation, drawing from rng if given, else the global (optionally seeded) state."""
         if seed is not None:
             np.random.seed(seed)
-            
-        tco_results = []
         
-        for i in range(iterations):
-            # 1. Create the overrides dictionary from sampled parameters
-            sample_overrides = {
-                param.override_key: param.sample()
-                for param in self.parameters.values()
-            }
-            
-            # 2. Calculate TCO directly, passing the base inputs and the new overrides
-            from .calculations import calculate_tco_from_inputs
-            tco = calculate_tco_from_inputs(self.base_inputs, overrides=sample_overrides)
-            tco_results.append(tco.total_cost)
+        tco_values = np.empty(iterations, dtype=np.float64)
+        self.run_into(tco_values, rng)
+        
+        return SimulationResults(iterations=iterations, tco_values=tco_values)
+    
+    def run_into(self, out: np.ndarray, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Simulate one total cost per element of a preallocated 1-D array.
+        
+        Args:
+            out: Float array to fill; its length sets the number of iterations
+            rng: Generator to draw from (defaults to the global NumPy random state)
             
-        return SimulationResults(
-            iterations=iterations,
-            tco_values=np.array(tco_results)
-        )
+        Returns:
+            out, filled with simulated total costs
+        """
+        iterations = out.shape[0]
+        
+        # 1. Sample every parameter for all iterations at once
+        sampled_overrides = {
+            param.override_key: param.sample_many(iterations, rng)
+            for param in self.parameters.values()
+        }
+        
+        # 2. Calculate the base TCO once, then apply all samples in a single vectorised pass
+        from .calculations import calculate_tco_from_inputs
+        base_tco = calculate_tco_from_inputs(self.base_inputs)
+        out[:] = _total_cost_kernel(base_tco, self.base_inputs.vehicle.drivetrain_type, sampled_overrides)
+        return out
     
     def compare_uncertainty(
         self, 
         other_inputs: VehicleInputs, 
-        iterations: int = 10000
+        iterations: int = 10000,
+        rng: Optional[np.random.Generator] = None
     ) -> Tuple[SimulationResults, SimulationResults, np.ndarray]:
         """Compare uncertainty between two vehicles (e.g., BEV vs Diesel)."""
         # Run simulation for this vehicle
-        results1 = self.run(iterations)
+        results1 = self.run(iterations, rng=rng)
         
         # Run simulation for other vehicle
         other_sim = MonteCarloSimulation(other_inputs)
@@ -186,7 +251,7 @@ class MonteCarloSimulation:
             if name not in ['battery_life_variation', 'charging_efficiency_variation']:
                 other_sim.parameters[name] = param
                 
-        results2 = other_sim.run(iterations)
+        results2 = other_sim.run(iterations, rng=rng)
         
         # Calculate differences
         differences = results1.tco_values - results2.tco_values
@@ -194,6 +259,16 @@ class MonteCarloSimulation:
         return results1, results2, differences
 
 
+# Sensitivity parameter names and the override each multiplier maps to
+_SENSITIVITY_MULTIPLIER_KEYS = {
+    'diesel_price': 'fuel_price_variation',
+    'electricity_price': 'electricity_price_variation',
+    'maintenance_cost': 'maintenance_cost_variation',
+    'battery_life': 'battery_life_variation',
+    'residual_value': 'residual_value_variation',
+}
+
+
 class SensitivityAnalysis:
     """Perform deterministic sensitivity analysis."""
     
@@ -202,6 +277,26 @@ class SensitivityAnalysis:
         from .calculations import calculate_tco_from_inputs
         self.base_tco = calculate_tco_from_inputs(base_inputs)
         
+    def analyse_parameter_bulk(self, parameter_name: str, multipliers: np.ndarray) -> np.ndarray:
+        """
+        Analyse sensitivity to a multiplier parameter for many values in one vectorised pass.
+        
+        Returns: Array of shape (n, 3) with columns (multiplier, total_cost, percent_change)
+        """
+        multipliers = np.asarray(multipliers, dtype=np.float64)
+        
+        # Unknown parameters leave the TCO unchanged, as in analyse_parameter
+        override_key = _SENSITIVITY_MULTIPLIER_KEYS.get(parameter_name)
+        overrides = {override_key: multipliers} if override_key else {}
+        
+        total_costs = np.broadcast_to(
+            _total_cost_kernel(self.base_tco, self.base_inputs.vehicle.drivetrain_type, overrides),
+            multipliers.shape
+        )
+        percent_change = (total_costs - self.base_tco.total_cost) / self.base_tco.total_cost * 100
+        
+        return np.column_stack((multipliers, total_costs, percent_change))
+    
     def analyse_parameter(
         self,
         parameter_name: str,
@@ -213,24 +308,16 @@ class SensitivityAnalysis:
         
         Returns: List of (parameter_value, total_cost, percent_change)
         """
+        if parameter_type == 'multiplier':
+            return [tuple(row) for row in self.analyse_parameter_bulk(parameter_name, values).tolist()]
+        
         results = []
         
         for value in values:
             # Create overrides dictionary based on parameter name and type
             overrides = {}
             
-            if parameter_type == 'multiplier':
-                if parameter_name == 'diesel_price':
-                    overrides['fuel_price_variation'] = value
-                elif parameter_name == 'electricity_price':
-                    overrides['electricity_price_variation'] = value
-                elif parameter_name == 'maintenance_cost':
-                    overrides['maintenance_cost_variation'] = value
-                elif parameter_name == 'battery_life':
-                    overrides['battery_life_variation'] = value
-                elif parameter_name == 'residual_value':
-                    overrides['residual_value_variation'] = value
-            elif parameter_type == 'absolute':
+            if parameter_type == 'absolute':
                 if parameter_name == 'annual_kms':
                     overrides['annual_kms_variation'] = value
                     
@@ -259,18 +346,18 @@ class SensitivityAnalysis:
             List of (parameter_name, low_impact, high_impact, range)
             sorted by impact range
         """
-        results = []
+        names = list(parameters)
         
-        for param_name, (low, high) in parameters.items():
-            # Calculate impact at low and high values
-            low_results = self.analyse_parameter(param_name, [low])
-            high_results = self.analyse_parameter(param_name, [high])
-            
-            low_impact = low_results[0][2]  # Percent change
-            high_impact = high_results[0][2]  # Percent change
-            impact_range = abs(high_impact - low_impact)
-            
-            results.append((param_name, low_impact, high_impact, impact_range))
-            
-        # Sort by impact range (largest first)
-        return sorted(results, key=lambda x: x[3], reverse=True)
\ No newline at end of file
+        # Percent change at the low and high value of each parameter
+        impacts = np.array([
+            self.analyse_parameter_bulk(name, np.array(parameters[name]))[:, 2]
+            for name in names
+        ]).reshape(len(names), 2)
+        impact_ranges = np.abs(impacts[:, 1] - impacts[:, 0])
+        
+        # Sort by impact range (largest first), keeping input order for ties
+        order = np.argsort(-impact_ranges, kind='stable')
+        return [
+            (names[i], float(impacts[i, 0]), float(impacts[i, 1]), float(impact_ranges[i]))
+            for i in order
+        ]
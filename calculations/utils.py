@@ -3,9 +3,18 @@ Financial utility functions for TCO analysis.
 Handles present value calculations and discounting.
 """
 
+import numpy as np
 import data.constants as const
 from typing import List
 
+# Discount factors for the default rate, computed once at import. Cumulative sums
+# give the annuity factor for any horizon up to vehicle life / financing term.
+_PRECOMPUTED_RATE = const.DISCOUNT_RATE
+_DISCOUNT_FACTORS_ANNUAL = 1 / (1 + _PRECOMPUTED_RATE) ** np.arange(1, const.VEHICLE_LIFE + 1)
+_DISCOUNT_FACTORS_MONTHLY = 1 / (1 + _PRECOMPUTED_RATE) ** (np.arange(1, const.FINANCING_TERM * 12 + 1) / 12.0)
+_ANNUITY_FACTORS_ANNUAL = np.cumsum(_DISCOUNT_FACTORS_ANNUAL)
+_ANNUITY_FACTORS_MONTHLY = np.cumsum(_DISCOUNT_FACTORS_MONTHLY)
+
 
 def calculate_present_value(annual_amount: float, years: int, discount_rate: float = const.DISCOUNT_RATE) -> float:
     """
@@ -17,6 +26,9 @@ def calculate_present_value(annual_amount: float, years: int, discount_rate: flo
     if discount_rate == 0:
         return annual_amount * years
     
+    if discount_rate == _PRECOMPUTED_RATE and 0 < years <= len(_ANNUITY_FACTORS_ANNUAL):
+        return annual_amount * _ANNUITY_FACTORS_ANNUAL[years - 1]
+    
     return annual_amount * ((1 - (1 + discount_rate) ** -years) / discount_rate)
 
 
@@ -34,6 +46,9 @@ def calculate_npv_of_payments(monthly_payment: float, num_payments: int, discoun
     """
     Calculate net present value of a series of monthly payments.
     
+    Formula: NPV = Payment × [(1 - g^-n) / (g - 1)]
+    where g = (1 + r)^(1/12), n = number of monthly payments
+    
     Args:
         monthly_payment: Monthly payment amount
         num_payments: Total number of payments
@@ -42,15 +57,16 @@ def calculate_npv_of_payments(monthly_payment: float, num_payments: int, discoun
     Returns:
         Net present value of all payments
     """
-    npv = 0.0
+    # Default rate within the financing term uses the precomputed factors
+    if discount_rate == _PRECOMPUTED_RATE and 0 < num_payments <= len(_ANNUITY_FACTORS_MONTHLY):
+        return float(monthly_payment * _ANNUITY_FACTORS_MONTHLY[num_payments - 1])
     
-    for month in range(1, num_payments + 1):
-        # Calculate the discount factor for this month
-        year_fraction = month / 12.0
-        discount_factor = (1 + discount_rate) ** year_fraction
-        npv += monthly_payment / discount_factor
+    if discount_rate == 0:
+        return monthly_payment * num_payments
     
-    return npv
+    # Monthly payments form a geometric series, so sum it in closed form
+    monthly_growth = (1 + discount_rate) ** (1 / 12.0)
+    return monthly_payment * ((1 - monthly_growth ** -num_payments) / (monthly_growth - 1))
 
 
 def calculate_annualised_cost(total_cost: float, years: int, discount_rate: float = const.DISCOUNT_RATE) -> float:
@@ -62,6 +78,9 @@ def calculate_annualised_cost(total_cost: float, years: int, discount_rate: floa
     if discount_rate == 0:
         return total_cost / years
     
+    if discount_rate == _PRECOMPUTED_RATE and 0 < years <= len(_ANNUITY_FACTORS_ANNUAL):
+        return total_cost / _ANNUITY_FACTORS_ANNUAL[years - 1]
+    
     return total_cost / ((1 - (1 + discount_rate) ** -years) / discount_rate)
 
 
@@ -85,7 +104,32 @@ def calculate_npv_of_annual_cashflows(cashflows: List[float], discount_rate: flo
     Returns:
         Net present value of all cashflows
     """
+    # Running discount factor (year 1 undiscounted, as in discount_to_present)
+    growth = 1 + discount_rate
+    discount_factor = 1.0
     npv = 0.0
-    for year, amount in enumerate(cashflows, 1):
-        npv += discount_to_present(amount, year, discount_rate)
-    return npv 
\ No newline at end of file
+    for amount in cashflows:
+        npv += amount / discount_factor
+        discount_factor *= growth
+    return npv
+
+
+def calculate_npv_of_annual_cashflow_rows(cashflows: np.ndarray, discount_rate: float = const.DISCOUNT_RATE) -> np.ndarray:
+    """
+    Calculate net present value of each row of annual cashflows.
+    
+    Row-wise equivalent of calculate_npv_of_annual_cashflows, discounting every
+    row with one matrix-vector product.
+    
+    Args:
+        cashflows: Array whose last axis holds cashflows for years 1 to n
+        discount_rate: Annual discount rate
+    
+    Returns:
+        Array of net present values with the last axis removed
+    """
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    
+    # Year 1 undiscounted, as in discount_to_present
+    discount_factors = 1 / (1 + discount_rate) ** np.arange(cashflows.shape[-1])
+    return cashflows @ discount_factors
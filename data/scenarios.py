@@ -3,7 +3,7 @@ Economic and environmental scenarios for TCO modelling to enable scenario-based
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 import numpy as np
 
 # ============================================================================
@@ -18,28 +18,28 @@ class EconomicScenario:
     description: str
     
     # Price trajectories (as annual multipliers from base year)
-    diesel_price_trajectory: List[float] = field(default_factory=list)
-    electricity_price_trajectory: List[float] = field(default_factory=list)
-    battery_price_trajectory: List[float] = field(default_factory=list)
-    carbon_price_trajectory: List[float] = field(default_factory=list)
+    diesel_price_trajectory: Tuple[float, ...] = field(default_factory=tuple)
+    electricity_price_trajectory: Tuple[float, ...] = field(default_factory=tuple)
+    battery_price_trajectory: Tuple[float, ...] = field(default_factory=tuple)
+    carbon_price_trajectory: Tuple[float, ...] = field(default_factory=tuple)
     
     # Technology improvement curves
-    bev_efficiency_improvement: List[float] = field(default_factory=list)  # Annual improvement in kWh/km
-    diesel_efficiency_improvement: List[float] = field(default_factory=list)  # Annual improvement in L/km
+    bev_efficiency_improvement: Tuple[float, ...] = field(default_factory=tuple)  # Annual improvement in kWh/km
+    diesel_efficiency_improvement: Tuple[float, ...] = field(default_factory=tuple)  # Annual improvement in L/km
     
     # Maintenance cost trajectory
-    maintenance_cost_multiplier: List[float] = field(default_factory=list)  # Multiplier for maintenance costs by year
+    maintenance_cost_multiplier: Tuple[float, ...] = field(default_factory=tuple)  # Multiplier for maintenance costs by year
     
     # Market factors
-    bev_residual_value_multiplier: List[float] = field(default_factory=list)  # Adjustment to depreciation
-    infrastructure_cost_trajectory: List[float] = field(default_factory=list)
+    bev_residual_value_multiplier: Tuple[float, ...] = field(default_factory=tuple)  # Adjustment to depreciation
+    infrastructure_cost_trajectory: Tuple[float, ...] = field(default_factory=tuple)
     
     # Policy evolution
     policy_phase_out_year: Optional[int] = None  # Year when subsidies end
     road_user_charge_bev_start_year: Optional[int] = None  # Year when RUC applies to BEVs
     
     def __post_init__(self):
-        """Validate and extend trajectories to standard vehicle life."""
+        """Validate and extend trajectories to standard vehicle life, storing them as tuples of floats."""
         from data.constants import VEHICLE_LIFE
         
         # Extend all trajectories to vehicle life if shorter
@@ -54,16 +54,16 @@ class EconomicScenario:
         self._extend_trajectory('infrastructure_cost_trajectory', VEHICLE_LIFE, 1.0)
     
     def _extend_trajectory(self, attr_name: str, target_length: int, default_value: float):
-        """Extend a trajectory list to target length."""
-        trajectory = getattr(self, attr_name)
+        """Extend a trajectory to target length and store it as an immutable tuple of floats."""
+        # Copy into a tuple so the stored trajectory never aliases a caller's list or array
+        trajectory = tuple(float(value) for value in getattr(self, attr_name))
         if not trajectory:
             # If empty, create constant trajectory
-            setattr(self, attr_name, [default_value] * target_length)
+            trajectory = (float(default_value),) * target_length
         elif len(trajectory) < target_length:
             # Extend with last value
-            last_value = trajectory[-1]
-            trajectory.extend([last_value] * (target_length - len(trajectory)))
-            setattr(self, attr_name, trajectory)
+            trajectory += (trajectory[-1],) * (target_length - len(trajectory))
+        setattr(self, attr_name, trajectory)
     
     def get_diesel_price_multiplier(self, year: int) -> float:
         """Get diesel price multiplier for a specific year."""
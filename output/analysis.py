@@ -3,7 +3,6 @@ Core analysis functions for TCO reporting.
 """
 
 import numpy as np
-import numpy_financial as npf
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 from collections import defaultdict
@@ -267,7 +266,7 @@ def analyse_purchase_timing(
                     setattr(adjusted_scenario, attr, trajectory[years_offset:])
                 else:
                     # If we've gone past the trajectory, use last value
-                    setattr(adjusted_scenario, attr, [trajectory[-1]] * const.VEHICLE_LIFE)
+                    setattr(adjusted_scenario, attr, (trajectory[-1],) * const.VEHICLE_LIFE)
             
             # Adjust policy phase-out year if applicable
             if adjusted_scenario.policy_phase_out_year:
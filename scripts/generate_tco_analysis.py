@@ -7,18 +7,16 @@ This script produces:
 1. TCO calculations for all light and medium rigid vehicles
 2. Year-by-year breakdown of costs
 3. Complete readout of all variables, inputs, policies, and scenario parameters
+
+Run from the project root with `python -m scripts.generate_tco_analysis`.
 """
 
-import sys
-import os
 from datetime import datetime
 from typing import Dict, List
 import json
+import sys
 
-# Add parent directory to path to import app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from app import calculate_all_tcos, vehicle_data, VehicleInputs
+from calculations import calculate_all_tcos, calculate_tco, vehicle_data, VehicleInputs
 from data.vehicles import ALL_MODELS, VehicleModel
 from data.scenarios import SCENARIOS, set_active_scenario, get_active_scenario
 from data.constants import *
@@ -62,18 +60,18 @@ def generate_scenario_summary(scenario_name: str = 'baseline') -> Dict:
         'scenario_name': scenario.name,
         'scenario_description': scenario.description,
         'price_trajectories': {
-            'diesel_price_trajectory': scenario.diesel_price_trajectory,
-            'electricity_price_trajectory': scenario.electricity_price_trajectory,
-            'battery_price_trajectory': scenario.battery_price_trajectory,
-            'carbon_price_trajectory': scenario.carbon_price_trajectory,
+            'diesel_price_trajectory': list(scenario.diesel_price_trajectory),
+            'electricity_price_trajectory': list(scenario.electricity_price_trajectory),
+            'battery_price_trajectory': list(scenario.battery_price_trajectory),
+            'carbon_price_trajectory': list(scenario.carbon_price_trajectory),
         },
         'technology_improvements': {
-            'bev_efficiency_improvement': scenario.bev_efficiency_improvement,
-            'diesel_efficiency_improvement': scenario.diesel_efficiency_improvement,
+            'bev_efficiency_improvement': list(scenario.bev_efficiency_improvement),
+            'diesel_efficiency_improvement': list(scenario.diesel_efficiency_improvement),
         },
         'cost_multipliers': {
-            'maintenance_cost_multiplier': scenario.maintenance_cost_multiplier,
-            'bev_residual_value_multiplier': getattr(scenario, 'bev_residual_value_multiplier', [1.0] * 15),
+            'maintenance_cost_multiplier': list(scenario.maintenance_cost_multiplier),
+            'bev_residual_value_multiplier': list(scenario.bev_residual_value_multiplier),
         },
         'policy_parameters': {
             'policy_phase_out_year': scenario.policy_phase_out_year,
@@ -249,7 +247,6 @@ def main():
         vehicle_inputs = vehicle_data.get_vehicle(vehicle.vehicle_id, scenario, 'financed')
         
         # Calculate TCO
-        from app import calculate_tco
         tco_result = calculate_tco(vehicle, scenario, 'financed')
         
         # Store TCO results
@@ -278,29 +275,30 @@ def main():
     with open(output_file, 'w') as f:
         json.dump(analysis_results, f, indent=2, default=str)
     
-    print(f"\nAnalysis complete! Results saved to: {output_file}")
-    
-    # Print summary
-    print("\n" + "=" * 80)
-    print("SUMMARY OF TCO RESULTS")
-    print("=" * 80)
-    
-    print(f"\nScenario: {scenario.name} - {scenario.description}")
-    print(f"Analysis Period: 2024-2035")
-    print(f"Vehicle Life: {VEHICLE_LIFE} years")
-    print(f"Discount Rate: {DISCOUNT_RATE:.1%}")
-    
-    print(f"\nTCO Results (NPV, AUD):")
-    print("-" * 60)
-    print(f"{'Vehicle ID':<12} {'Model':<25} {'Type':<8} {'Total TCO':<12} {'Annual':<10} {'$/km':<8}")
-    print("-" * 60)
+    # Collect the summary and write it in one go
+    lines = [
+        f"\nAnalysis complete! Results saved to: {output_file}",
+        "\n" + "=" * 80,
+        "SUMMARY OF TCO RESULTS",
+        "=" * 80,
+        f"\nScenario: {scenario.name} - {scenario.description}",
+        "Analysis Period: 2024-2035",
+        f"Vehicle Life: {VEHICLE_LIFE} years",
+        f"Discount Rate: {DISCOUNT_RATE:.1%}",
+        "\nTCO Results (NPV, AUD):",
+        "-" * 60,
+        f"{'Vehicle ID':<12} {'Model':<25} {'Type':<8} {'Total TCO':<12} {'Annual':<10} {'$/km':<8}",
+        "-" * 60,
+    ]
     
+    vehicles_by_id = {v.vehicle_id: v for v in target_vehicles}
     for vehicle_id, tco in analysis_results['tco_results'].items():
-        vehicle = next(v for v in target_vehicles if v.vehicle_id == vehicle_id)
-        print(f"{vehicle_id:<12} {vehicle.model_name[:24]:<25} {vehicle.drivetrain_type:<8} "
-              f"${tco['total_cost']:>10,.0f} ${tco['annual_cost']:>8,.0f} ${tco['cost_per_km']:>6.2f}")
+        vehicle = vehicles_by_id[vehicle_id]
+        lines.append(f"{vehicle_id:<12} {vehicle.model_name[:24]:<25} {vehicle.drivetrain_type:<8} "
+                     f"${tco['total_cost']:>10,.0f} ${tco['annual_cost']:>8,.0f} ${tco['cost_per_km']:>6.2f}")
     
-    print(f"\nDetailed analysis with year-by-year breakdowns saved to: {output_file}")
+    lines.append(f"\nDetailed analysis with year-by-year breakdowns saved to: {output_file}")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return analysis_results
 
@@ -7,18 +7,21 @@ This analysis shows:
 1. How purchase prices change over time (especially for BEVs with falling battery costs)
 2. How operating costs evolve based on purchase year
 3. The changing economics between BEV and diesel over time
+
+Run from the project root with `python -m scripts.purchase_year_analysis`.
 """
 
 import sys
-import os
+import time
+from dataclasses import replace
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 import json
 
-# Add parent directory to path to import app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pandas as pd
 
-from app import calculate_tco, vehicle_data
+from calculations import calculate_tco, vehicle_data
 from data.vehicles import ALL_MODELS, VehicleModel, BY_ID
 from data.scenarios import SCENARIOS, EconomicScenario
 from data.constants import VEHICLE_LIFE
@@ -39,34 +42,34 @@ def create_purchase_year_scenario(base_scenario: EconomicScenario, purchase_year
     # Calculate years since baseline start (2024)
     years_offset = purchase_year - 2024
     
+    # Purchasing in the base year leaves every trajectory unchanged
+    if years_offset == 0:
+        return base_scenario
+    
     # Extend trajectories if needed to cover full vehicle life from purchase year
-    def extend_trajectory(trajectory: List[float], default_growth: float = 0.0) -> List[float]:
+    def extend_trajectory(trajectory: np.ndarray, default_growth: float = 0.0) -> np.ndarray:
         """Extend trajectory to cover full vehicle life from purchase year."""
-        if not trajectory:
-            return [1.0] * VEHICLE_LIFE
+        trajectory = np.asarray(trajectory, dtype=np.float64)
+        if trajectory.size == 0:
+            return np.ones(VEHICLE_LIFE)
         
-        extended = trajectory.copy()
-        
-        # If we need more years, extend based on the trend
-        while len(extended) < years_offset + VEHICLE_LIFE:
-            if len(extended) >= 2 and extended[-2] != 0:
-                # Calculate growth rate from last two values
-                growth_rate = (extended[-1] / extended[-2]) - 1
+        # If we need more years, extend based on the trend of the last two values
+        missing_years = years_offset + VEHICLE_LIFE - trajectory.size
+        if missing_years > 0:
+            if trajectory.size >= 2 and trajectory[-2] != 0:
+                growth_rate = (trajectory[-1] / trajectory[-2]) - 1
             else:
                 growth_rate = default_growth
             
-            if extended[-1] == 0 and growth_rate == 0:
-                # If last value is zero and no growth, keep extending with zeros
-                next_value = 0
-            else:
-                next_value = extended[-1] * (1 + growth_rate)
-            extended.append(next_value)
+            # Constant growth from the last value (a zero last value stays zero)
+            tail = trajectory[-1] * (1 + growth_rate) ** np.arange(1, missing_years + 1)
+            trajectory = np.concatenate((trajectory, tail))
         
         # Extract the relevant 15-year period starting from purchase year
         start_idx = years_offset
         end_idx = start_idx + VEHICLE_LIFE
         
-        return extended[start_idx:end_idx]
+        return trajectory[start_idx:end_idx]
     
     # Create adjusted trajectories
     adjusted_scenario = EconomicScenario(
@@ -116,6 +119,108 @@ def calculate_adjusted_vehicle_price(vehicle: VehicleModel, purchase_year: int,
     return vehicle.msrp
 
 
+def _average_tco_and_cost_per_km(year_results: Dict, vehicle_ids: List[str]) -> Tuple[float, float]:
+    """Average total TCO and cost per km over the given vehicles (zero if there are none)."""
+    if not vehicle_ids:
+        return 0, 0
+    
+    tcos = np.empty(len(vehicle_ids))
+    costs_per_km = np.empty(len(vehicle_ids))
+    for i, vehicle_id in enumerate(vehicle_ids):
+        data = year_results[vehicle_id]
+        tcos[i] = data['total_tco']
+        costs_per_km[i] = data['cost_per_km']
+    
+    return float(tcos.mean()), float(costs_per_km.mean())
+
+
+def _analyse_single_year(
+    purchase_year: int,
+    base_scenario: EconomicScenario,
+    target_vehicles: List[VehicleModel]
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    Analyse TCO for a single purchase year.
+    
+    Returns:
+        Tuple of (year_results, year_summary, year_savings)
+    """
+    # Create scenario for this purchase year
+    year_scenario = create_purchase_year_scenario(base_scenario, purchase_year)
+    
+    year_results = {}
+    
+    for vehicle in target_vehicles:
+        # Calculate adjusted vehicle price
+        adjusted_price = calculate_adjusted_vehicle_price(vehicle, purchase_year, base_scenario)
+        
+        # Create adjusted vehicle model (VehicleModel is frozen, so copy with the new price)
+        if adjusted_price == vehicle.msrp:
+            adjusted_vehicle = vehicle
+        else:
+            adjusted_vehicle = replace(vehicle, msrp=adjusted_price)
+        
+        # Calculate TCO
+        tco_result = calculate_tco(adjusted_vehicle, year_scenario, 'financed')
+        
+        year_results[vehicle.vehicle_id] = {
+            'adjusted_msrp': adjusted_price,
+            'price_change_from_2024': adjusted_price - vehicle.msrp,
+            'price_change_percent': ((adjusted_price - vehicle.msrp) / vehicle.msrp) * 100,
+            'total_tco': tco_result.total_cost,
+            'annual_cost': tco_result.annual_cost,
+            'cost_per_km': tco_result.cost_per_km,
+            'fuel_cost': tco_result.fuel_cost,
+            'maintenance_cost': tco_result.maintenance_cost,
+            'battery_replacement_cost': tco_result.battery_replacement_cost,
+            'financing_cost': tco_result.financing_cost,
+            'purchase_cost': tco_result.purchase_cost
+        }
+    
+    # Calculate summary statistics for this year
+    bev_ids = [v.vehicle_id for v in target_vehicles if v.drivetrain_type == 'BEV']
+    diesel_ids = [v.vehicle_id for v in target_vehicles if v.drivetrain_type == 'Diesel']
+    avg_bev_tco, avg_bev_cost_per_km = _average_tco_and_cost_per_km(year_results, bev_ids)
+    avg_diesel_tco, avg_diesel_cost_per_km = _average_tco_and_cost_per_km(year_results, diesel_ids)
+    
+    year_summary = {
+        'avg_bev_tco': avg_bev_tco,
+        'avg_diesel_tco': avg_diesel_tco,
+        'avg_bev_cost_per_km': avg_bev_cost_per_km,
+        'avg_diesel_cost_per_km': avg_diesel_cost_per_km,
+    }
+    
+    # Calculate BEV vs diesel savings for comparison pairs in one vectorised pass
+    vehicle_pos = {vehicle.vehicle_id: i for i, vehicle in enumerate(target_vehicles)}
+    pairs = [
+        (vehicle, BY_ID[vehicle.comparison_pair]) for vehicle in target_vehicles
+        if vehicle.drivetrain_type == 'BEV' and vehicle.comparison_pair in vehicle_pos
+    ]
+    
+    year_savings = {}
+    if pairs:
+        all_tcos = np.array([year_results[vehicle.vehicle_id]['total_tco'] for vehicle in target_vehicles])
+        pair_indices = np.array([(vehicle_pos[bev.vehicle_id], vehicle_pos[diesel.vehicle_id]) for bev, diesel in pairs])
+        
+        bev_tcos = all_tcos[pair_indices[:, 0]]
+        diesel_tcos = all_tcos[pair_indices[:, 1]]
+        savings = diesel_tcos - bev_tcos
+        savings_percent = (savings / diesel_tcos) * 100
+        
+        for i, (bev, diesel) in enumerate(pairs):
+            year_savings[f"{bev.vehicle_id}_vs_{diesel.vehicle_id}"] = {
+                'bev_model': bev.model_name,
+                'diesel_model': diesel.model_name,
+                'weight_class': bev.weight_class,
+                'absolute_savings': float(savings[i]),
+                'percent_savings': float(savings_percent[i]),
+                'bev_tco': float(bev_tcos[i]),
+                'diesel_tco': float(diesel_tcos[i])
+            }
+    
+    return year_results, year_summary, year_savings
+
+
 def analyse_purchase_years(start_year: int = 2024, end_year: int = 2030) -> Dict:
     """
     Analyse TCO for different purchase years.
@@ -128,6 +233,7 @@ def analyse_purchase_years(start_year: int = 2024, end_year: int = 2030) -> Dict
         Dictionary with analysis results
     """
     base_scenario = SCENARIOS['baseline']
+    purchase_years = list(range(start_year, end_year + 1))
     
     # Filter to light and medium rigid vehicles
     target_vehicles = [
@@ -139,9 +245,8 @@ def analyse_purchase_years(start_year: int = 2024, end_year: int = 2030) -> Dict
         'metadata': {
             'analysis_type': 'Purchase Year Analysis',
             'base_scenario': base_scenario.name,
-            'purchase_years': list(range(start_year, end_year + 1)),
+            'purchase_years': purchase_years,
             'vehicle_life': VEHICLE_LIFE,
-            'generation_timestamp': datetime.now().isoformat(),
         },
         'vehicle_specifications': {},
         'purchase_year_analysis': {},
@@ -161,98 +266,31 @@ def analyse_purchase_years(start_year: int = 2024, end_year: int = 2030) -> Dict
         }
     
     # Analyse each purchase year
-    for purchase_year in range(start_year, end_year + 1):
+    for purchase_year in purchase_years:
         print(f"Analysing purchase year {purchase_year}...")
         
-        # Create scenario for this purchase year
-        year_scenario = create_purchase_year_scenario(base_scenario, purchase_year)
-        
-        year_results = {}
-        
-        for vehicle in target_vehicles:
-            # Calculate adjusted vehicle price
-            adjusted_price = calculate_adjusted_vehicle_price(vehicle, purchase_year, base_scenario)
-            
-            # Create adjusted vehicle model
-            adjusted_vehicle = VehicleModel(
-                vehicle_id=vehicle.vehicle_id,
-                comparison_pair=vehicle.comparison_pair,
-                weight_class=vehicle.weight_class,
-                drivetrain_type=vehicle.drivetrain_type,
-                model_name=vehicle.model_name,
-                payload=vehicle.payload,
-                msrp=adjusted_price,
-                range_km=vehicle.range_km,
-                battery_capacity_kwh=vehicle.battery_capacity_kwh,
-                kwh_per_km=vehicle.kwh_per_km,
-                litres_per_km=vehicle.litres_per_km,
-                battery_replacement_per_kw=vehicle.battery_replacement_per_kw,
-                maintenance_cost_per_km=vehicle.maintenance_cost_per_km,
-                annual_registration=vehicle.annual_registration,
-                annual_kms=vehicle.annual_kms,
-                noise_pollution_per_km=vehicle.noise_pollution_per_km
-            )
-            
-            # Calculate TCO
-            tco_result = calculate_tco(adjusted_vehicle, year_scenario, 'financed')
-            
-            year_results[vehicle.vehicle_id] = {
-                'adjusted_msrp': adjusted_price,
-                'price_change_from_2024': adjusted_price - vehicle.msrp,
-                'price_change_percent': ((adjusted_price - vehicle.msrp) / vehicle.msrp) * 100,
-                'total_tco': tco_result.total_cost,
-                'annual_cost': tco_result.annual_cost,
-                'cost_per_km': tco_result.cost_per_km,
-                'fuel_cost': tco_result.fuel_cost,
-                'maintenance_cost': tco_result.maintenance_cost,
-                'battery_replacement_cost': tco_result.battery_replacement_cost,
-                'financing_cost': tco_result.financing_cost,
-                'purchase_cost': tco_result.purchase_cost
-            }
-        
+        year_results, year_summary, year_savings = _analyse_single_year(
+            purchase_year, base_scenario, target_vehicles
+        )
         results['purchase_year_analysis'][purchase_year] = year_results
-        
-        # Calculate summary statistics for this year
-        bev_tcos = [data['total_tco'] for vid, data in year_results.items() 
-                   if BY_ID[vid].drivetrain_type == 'BEV']
-        diesel_tcos = [data['total_tco'] for vid, data in year_results.items() 
-                      if BY_ID[vid].drivetrain_type == 'Diesel']
-        
-        results['summary_by_year'][purchase_year] = {
-            'avg_bev_tco': sum(bev_tcos) / len(bev_tcos) if bev_tcos else 0,
-            'avg_diesel_tco': sum(diesel_tcos) / len(diesel_tcos) if diesel_tcos else 0,
-            'avg_bev_cost_per_km': sum([data['cost_per_km'] for vid, data in year_results.items() 
-                                      if BY_ID[vid].drivetrain_type == 'BEV']) / len(bev_tcos) if bev_tcos else 0,
-            'avg_diesel_cost_per_km': sum([data['cost_per_km'] for vid, data in year_results.items() 
-                                         if BY_ID[vid].drivetrain_type == 'Diesel']) / len(diesel_tcos) if diesel_tcos else 0,
-        }
-        
-        # Calculate BEV vs diesel savings for comparison pairs
-        year_savings = {}
-        for vehicle in target_vehicles:
-            if vehicle.drivetrain_type == 'BEV':
-                bev_tco = year_results[vehicle.vehicle_id]['total_tco']
-                diesel_id = vehicle.comparison_pair
-                if diesel_id in year_results:
-                    diesel_tco = year_results[diesel_id]['total_tco']
-                    savings = diesel_tco - bev_tco
-                    savings_percent = (savings / diesel_tco) * 100
-                    
-                    year_savings[f"{vehicle.vehicle_id}_vs_{diesel_id}"] = {
-                        'bev_model': vehicle.model_name,
-                        'diesel_model': BY_ID[diesel_id].model_name,
-                        'weight_class': vehicle.weight_class,
-                        'absolute_savings': savings,
-                        'percent_savings': savings_percent,
-                        'bev_tco': bev_tco,
-                        'diesel_tco': diesel_tco
-                    }
-        
+        results['summary_by_year'][purchase_year] = year_summary
         results['bev_vs_diesel_savings'][purchase_year] = year_savings
     
+    # Stamp the results once the analysis itself is complete
+    results['metadata']['generation_timestamp'] = datetime.now().isoformat()
+    
     return results
 
 
+def _markdown_rows(df: pd.DataFrame, formatters: Dict[str, Callable[[object], str]]) -> List[str]:
+    """Format DataFrame rows as markdown table rows, applying one formatter per column."""
+    if df.empty:
+        return []
+    
+    cells = pd.DataFrame({column: df[column].map(formatter) for column, formatter in formatters.items()})
+    return ("| " + cells.apply(" | ".join, axis=1) + " |").tolist()
+
+
 def create_summary_tables(results: Dict) -> str:
     """Create formatted summary tables from the analysis results."""
     
@@ -265,43 +303,67 @@ def create_summary_tables(results: Dict) -> str:
     summary.append("| Purchase Year | Avg BEV TCO | Avg Diesel TCO | BEV Cost/km | Diesel Cost/km | BEV Advantage |")
     summary.append("|---------------|-------------|----------------|-------------|----------------|---------------|")
     
-    for year, data in results['summary_by_year'].items():
-        bev_tco = data['avg_bev_tco']
-        diesel_tco = data['avg_diesel_tco']
-        advantage = ((diesel_tco - bev_tco) / diesel_tco * 100) if diesel_tco > 0 else 0
-        
-        summary.append(f"| {year} | ${bev_tco:,.0f} | ${diesel_tco:,.0f} | ${data['avg_bev_cost_per_km']:.2f} | ${data['avg_diesel_cost_per_km']:.2f} | {advantage:.1f}% |")
+    summary_df = pd.DataFrame.from_dict(results['summary_by_year'], orient='index')
+    summary_df.index.name = 'year'
+    summary_df = summary_df.reset_index()
+    if not summary_df.empty:
+        diesel_tco = summary_df['avg_diesel_tco']
+        summary_df['bev_advantage'] = ((diesel_tco - summary_df['avg_bev_tco']) / diesel_tco * 100).where(diesel_tco > 0, 0)
+    
+    summary.extend(_markdown_rows(summary_df, {
+        'year': str,
+        'avg_bev_tco': '${:,.0f}'.format,
+        'avg_diesel_tco': '${:,.0f}'.format,
+        'avg_bev_cost_per_km': '${:.2f}'.format,
+        'avg_diesel_cost_per_km': '${:.2f}'.format,
+        'bev_advantage': '{:.1f}%'.format,
+    }))
+    
+    # BEV Price Evolution (one column per analysed purchase year)
+    years = results['metadata']['purchase_years']
+    # Purchase years are a dense range, so index results by position rather than by year key
+    year_array = [results['purchase_year_analysis'][year] for year in years]
+    bev_ids = [vehicle_id for vehicle_id, spec in results['vehicle_specifications'].items()
+               if spec['drivetrain_type'] == 'BEV']
     
-    # BEV Price Evolution
     summary.append("\n## BEV Price Evolution (Technology Cost Reductions)\n")
-    summary.append("| Vehicle | 2024 Price | 2025 Price | 2026 Price | 2027 Price | 2028 Price | 2029 Price | 2030 Price |")
-    summary.append("|---------|------------|------------|------------|------------|------------|------------|------------|")
-    
-    for vehicle_id, spec in results['vehicle_specifications'].items():
-        if spec['drivetrain_type'] == 'BEV':
-            row = [f"| {spec['model_name'][:20]}"]
-            for year in range(2024, 2031):
-                if year in results['purchase_year_analysis']:
-                    price = results['purchase_year_analysis'][year][vehicle_id]['adjusted_msrp']
-                    row.append(f"${price:,.0f}")
-                else:
-                    row.append("-")
-            summary.append(" | ".join(row) + " |")
+    summary.append("| Vehicle | " + " | ".join(f"{year} Price" for year in years) + " |")
+    summary.append("|---------|" + "|".join("------------" for _ in years) + "|")
     
-    # Comparison Pair Savings Evolution
-    summary.append("\n## BEV vs Diesel Savings by Purchase Year\n")
+    price_df = pd.DataFrame({
+        year: [year_results[vehicle_id]['adjusted_msrp'] for vehicle_id in bev_ids]
+        for year, year_results in zip(years, year_array)
+    })
+    price_df.insert(0, 'vehicle', [results['vehicle_specifications'][vehicle_id]['model_name'][:20]
+                                   for vehicle_id in bev_ids])
     
-    # Get first comparison pair as example
-    first_year = min(results['bev_vs_diesel_savings'].keys())
-    first_comparison = list(results['bev_vs_diesel_savings'][first_year].keys())[0]
+    summary.extend(_markdown_rows(price_df, {
+        'vehicle': str,
+        **{year: '${:,.0f}'.format for year in years},
+    }))
     
+    # Comparison Pair Savings Evolution
+    summary.append("\n## BEV vs Diesel Savings by Purchase Year\n")
     summary.append("| Purchase Year | Comparison | BEV Savings | Savings % |")
     summary.append("|---------------|------------|-------------|-----------|")
     
-    for year in sorted(results['bev_vs_diesel_savings'].keys()):
-        for comparison_id, data in results['bev_vs_diesel_savings'][year].items():
-            summary.append(f"| {year} | {data['bev_model'][:15]} vs {data['diesel_model'][:15]} | "
-                         f"${data['absolute_savings']:,.0f} | {data['percent_savings']:.1f}% |")
+    savings_df = pd.DataFrame([
+        {
+            'year': year,
+            'comparison': f"{data['bev_model'][:15]} vs {data['diesel_model'][:15]}",
+            'absolute_savings': data['absolute_savings'],
+            'percent_savings': data['percent_savings'],
+        }
+        for year in sorted(results['bev_vs_diesel_savings'].keys())
+        for data in results['bev_vs_diesel_savings'][year].values()
+    ])
+    
+    summary.extend(_markdown_rows(savings_df, {
+        'year': str,
+        'comparison': str,
+        'absolute_savings': '${:,.0f}'.format,
+        'percent_savings': '{:.1f}%'.format,
+    }))
     
     return "\n".join(summary)
 
@@ -311,8 +373,10 @@ def main():
     print("Purchase Year Analysis: TCO Evolution (2024-2030)")
     print("=" * 60)
     
-    # Run analysis
+    # Run analysis (monotonic clock for timing; wall-clock time only for file names)
+    start_ns = time.monotonic_ns()
     results = analyse_purchase_years(2024, 2030)
+    elapsed_seconds = (time.monotonic_ns() - start_ns) / 1e9
     
     # Save detailed results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -328,17 +392,17 @@ def main():
     with open(summary_file, 'w') as f:
         f.write(summary_text)
     
-    print(f"\nAnalysis complete!")
-    print(f"Detailed results: {output_file}")
-    print(f"Summary report: {summary_file}")
-    
-    # Print key findings
-    print("\n" + "=" * 60)
-    print("KEY FINDINGS")
-    print("=" * 60)
-    
-    print("\nAverage TCO Evolution:")
-    print("-" * 40)
+    # Collect the closing report and key findings, then write them in one go
+    lines = [
+        f"\nAnalysis complete in {elapsed_seconds:.2f}s!",
+        f"Detailed results: {output_file}",
+        f"Summary report: {summary_file}",
+        "\n" + "=" * 60,
+        "KEY FINDINGS",
+        "=" * 60,
+        "\nAverage TCO Evolution:",
+        "-" * 40,
+    ]
     for year in [2024, 2026, 2028, 2030]:
         if year in results['summary_by_year']:
             data = results['summary_by_year'][year]
@@ -346,20 +410,22 @@ def main():
             diesel_avg = data['avg_diesel_tco']
             advantage = ((diesel_avg - bev_avg) / diesel_avg * 100) if diesel_avg > 0 else 0
             
-            print(f"{year}: BEV ${bev_avg:,.0f} vs Diesel ${diesel_avg:,.0f} "
-                  f"(BEV {advantage:.1f}% cheaper)")
+            lines.append(f"{year}: BEV ${bev_avg:,.0f} vs Diesel ${diesel_avg:,.0f} "
+                         f"(BEV {advantage:.1f}% cheaper)")
     
     # Show price evolution for one BEV
     bev_vehicle = next(v for v in results['vehicle_specifications'].values() 
                       if v['drivetrain_type'] == 'BEV')
-    print(f"\n{bev_vehicle['model_name']} Price Evolution:")
-    print("-" * 40)
+    lines.append(f"\n{bev_vehicle['model_name']} Price Evolution:")
+    lines.append("-" * 40)
     for year in [2024, 2026, 2028, 2030]:
         if year in results['purchase_year_analysis']:
             price = results['purchase_year_analysis'][year][bev_vehicle['vehicle_id']]['adjusted_msrp']
             base_price = bev_vehicle['base_msrp']
             change = ((price - base_price) / base_price) * 100
-            print(f"{year}: ${price:,.0f} ({change:+.1f}% vs 2024)")
+            lines.append(f"{year}: ${price:,.0f} ({change:+.1f}% vs 2024)")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return results
 
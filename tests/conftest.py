@@ -1,12 +1,82 @@
 """
 Pytest configuration file.
-Adds project root to Python path for test imports.
+Provides shared fixtures; the project root is put on the import path via
+the pytest settings in pyproject.toml.
 """
 
-import sys
-import os
-from pathlib import Path
+import functools
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root)) 
\ No newline at end of file
+import numpy as np
+import pytest
+
+from calculations.calculations import calculate_tco, compare_vehicle_pairs
+from calculations.inputs import VehicleInputs, vehicle_data
+from calculations.simulation import MonteCarloSimulation
+from data.scenarios import SCENARIOS
+from data.vehicles import BY_ID
+
+
+@pytest.fixture(scope='session')
+def baseline_comparisons():
+    """BEV vs diesel pair comparisons under the baseline scenario, computed once per session."""
+    return compare_vehicle_pairs(SCENARIOS['baseline'])
+
+
+@pytest.fixture(scope='session')
+def cached_tco():
+    """
+    Memoised calculate_tco keyed by (vehicle_id, scenario_name, purchase_method).
+    
+    Keys are strings rather than model/scenario objects so they stay hashable;
+    returned TCOResults are shared and must be treated as read-only.
+    """
+    @functools.lru_cache(maxsize=None)
+    def _tco(vehicle_id: str, scenario_name: str = 'baseline', purchase_method: str = 'financed'):
+        return calculate_tco(BY_ID[vehicle_id], SCENARIOS[scenario_name], purchase_method)
+    
+    return _tco
+
+
+@pytest.fixture(scope='session')
+def cached_simulation():
+    """
+    Memoised Monte Carlo run keyed by (vehicle_id, iterations, seed).
+    
+    Only seeded runs are deterministic, so a seed is required; returned
+    SimulationResults are shared and must be treated as read-only.
+    """
+    @functools.lru_cache(maxsize=32)
+    def _simulation(vehicle_id: str, iterations: int, seed: int):
+        return MonteCarloSimulation(vehicle_data.get_vehicle(vehicle_id)).run(iterations=iterations, seed=seed)
+    
+    return _simulation
+
+
+@pytest.fixture(scope='module')
+def bev_model():
+    """Reference BEV model shared by the tests in a module."""
+    return BY_ID['BEV001']
+
+
+@pytest.fixture(scope='module')
+def diesel_model(bev_model):
+    """Diesel comparison pair of the reference BEV."""
+    return BY_ID[bev_model.comparison_pair]
+
+
+@pytest.fixture(scope='module')
+def bev_inputs(bev_model):
+    """Default VehicleInputs for the reference BEV; treat as read-only."""
+    return VehicleInputs(bev_model)
+
+
+@pytest.fixture(scope='module')
+def diesel_inputs(diesel_model):
+    """Default VehicleInputs for the reference diesel; treat as read-only."""
+    return VehicleInputs(diesel_model)
+
+
+@pytest.fixture
+def rng():
+    """Freshly seeded random Generator for reproducible Monte Carlo draws."""
+    return np.random.default_rng(42)